@@ -13,12 +13,18 @@ Requirements:
 """
 
 import json
+import os
 import re
 import sys
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from itertools import repeat
 
 # WCAG contrast ratio thresholds
 WCAG_AA_NORMAL = 4.5
@@ -26,6 +32,10 @@ WCAG_AA_LARGE = 3.0
 WCAG_AAA_NORMAL = 7.0
 WCAG_AAA_LARGE = 4.5
 
+# Swift scanning fans out to worker processes only for larger trees
+PARALLEL_SCAN_MIN_FILES = 64
+PARALLEL_SCAN_MAX_WORKERS = 8
+
 
 class ContrastLevel(Enum):
     FAIL = "FAIL"
@@ -35,8 +45,21 @@ class ContrastLevel(Enum):
     AAA_NORMAL = "AAA_NORMAL"
 
 
+# Ascending thresholds and the level reached at or above each one, for bisect
+_LEVEL_THRESHOLDS = (WCAG_AA_LARGE, WCAG_AA_NORMAL, WCAG_AAA_LARGE, WCAG_AAA_NORMAL)
+_LEVELS_BY_THRESHOLD = (
+    ContrastLevel.FAIL,
+    ContrastLevel.AA_LARGE,
+    ContrastLevel.AA_NORMAL,
+    ContrastLevel.AAA_LARGE,
+    ContrastLevel.AAA_NORMAL,
+)
+
+
 @dataclass
 class ColorPair:
+    __slots__ = ("foreground", "background", "context", "file", "line")
+    
     foreground: str
     background: str
     context: str
@@ -46,6 +69,8 @@ class ColorPair:
 
 @dataclass
 class ContrastResult:
+    __slots__ = ("foreground", "background", "ratio", "level", "context", "file", "line")
+    
     foreground: str
     background: str
     ratio: float
@@ -55,6 +80,7 @@ class ContrastResult:
     line: int
 
 
+@lru_cache(maxsize=4096)
 def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
     """Convert hex color to RGB tuple."""
     hex_color = hex_color.lstrip('#')
@@ -68,63 +94,79 @@ def rgb_to_hex(r: int, g: int, b: int) -> str:
     return f"#{r:02x}{g:02x}{b:02x}"
 
 
+def srgb_to_linear(channel: int) -> float:
+    """Linearize an 8-bit sRGB channel according to WCAG 2.1."""
+    val = channel / 255.0
+    if val <= 0.03928:
+        return val / 12.92
+    return ((val + 0.055) / 1.055) ** 2.4
+
+
+# parse_color_value only yields 8-bit channels, so linearize each possible
+# value once up front
+_SRGB_LUT = tuple(srgb_to_linear(channel) for channel in range(256))
+
+
 def relative_luminance(r: int, g: int, b: int) -> float:
     """Calculate relative luminance according to WCAG 2.1."""
-    def normalize(channel: int) -> float:
-        val = channel / 255.0
-        if val <= 0.03928:
-            return val / 12.92
-        return ((val + 0.055) / 1.055) ** 2.4
-    
-    r_norm = normalize(r)
-    g_norm = normalize(g)
-    b_norm = normalize(b)
-    
-    return 0.2126 * r_norm + 0.7152 * g_norm + 0.0722 * b_norm
+    return 0.2126 * _SRGB_LUT[r] + 0.7152 * _SRGB_LUT[g] + 0.0722 * _SRGB_LUT[b]
 
 
-def contrast_ratio(color1: Tuple[int, int, int], color2: Tuple[int, int, int]) -> float:
-    """Calculate contrast ratio between two colors."""
-    l1 = relative_luminance(*color1)
-    l2 = relative_luminance(*color2)
-    
+def relative_luminances(colors: Iterable[Tuple[int, int, int]]) -> List[float]:
+    """Calculate relative luminance for a batch of RGB colors."""
+    return [relative_luminance(*color) for color in colors]
+
+
+def ratio_from_luminance(l1: float, l2: float) -> float:
+    """Calculate contrast ratio from two precomputed luminances."""
     lighter = max(l1, l2)
     darker = min(l1, l2)
     
     return (lighter + 0.05) / (darker + 0.05)
 
 
+def contrast_ratio(color1: Tuple[int, int, int], color2: Tuple[int, int, int]) -> float:
+    """Calculate contrast ratio between two colors."""
+    return ratio_from_luminance(relative_luminance(*color1), relative_luminance(*color2))
+
+
+def contrast_ratio_matrix(fg_luminances: List[float], bg_luminances: List[float]) -> List[List[float]]:
+    """Calculate contrast ratios for every foreground x background luminance pair."""
+    # Same arithmetic as ratio_from_luminance, fused into the inner loop:
+    # the 0.05 flare offset is added once per color rather than once per pair
+    fg_offsets = [fg + 0.05 for fg in fg_luminances]
+    bg_offsets = [bg + 0.05 for bg in bg_luminances]
+    return [
+        [fg / bg if fg >= bg else bg / fg for bg in bg_offsets]
+        for fg in fg_offsets
+    ]
+
+
 def get_contrast_level(ratio: float) -> ContrastLevel:
     """Determine WCAG compliance level."""
-    if ratio >= WCAG_AAA_NORMAL:
-        return ContrastLevel.AAA_NORMAL
-    elif ratio >= WCAG_AAA_LARGE:
-        return ContrastLevel.AAA_LARGE
-    elif ratio >= WCAG_AA_NORMAL:
-        return ContrastLevel.AA_NORMAL
-    elif ratio >= WCAG_AA_LARGE:
-        return ContrastLevel.AA_LARGE
-    else:
-        return ContrastLevel.FAIL
+    return _LEVELS_BY_THRESHOLD[bisect_right(_LEVEL_THRESHOLDS, ratio)]
+
+
+# Simplified color blindness approximations as row-major RGB matrices
+COLORBLINDNESS_MATRICES = {
+    # Red-blind: red channel becomes darker
+    "protanopia": ((0.567, 0.433, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)),
+    # Green-blind: green channel becomes darker
+    "deuteranopia": ((1.0, 0.0, 0.0), (0.375, 0.625, 0.0), (0.0, 0.0, 1.0)),
+    # Blue-blind: blue channel becomes darker
+    "tritanopia": ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.05, 0.0, 0.95)),
+}
 
 
 def simulate_colorblindness(r: int, g: int, b: int, type: str) -> Tuple[int, int, int]:
     """Simulate color blindness (simplified approximation)."""
-    if type == "protanopia":  # Red-blind
-        # Red channel becomes darker
-        r_new = int(0.567 * r + 0.433 * g)
-        return (r_new, g, b)
-    elif type == "deuteranopia":  # Green-blind
-        # Green channel becomes darker
-        g_new = int(0.625 * g + 0.375 * r)
-        return (r, g_new, b)
-    elif type == "tritanopia":  # Blue-blind
-        # Blue channel becomes darker
-        b_new = int(0.95 * b + 0.05 * r)
-        return (r, g, b_new)
-    return (r, g, b)
+    matrix = COLORBLINDNESS_MATRICES.get(type)
+    if matrix is None:
+        return (r, g, b)
+    return tuple(int(mr * r + mg * g + mb * b) for mr, mg, mb in matrix)
 
 
+@lru_cache(maxsize=4096)
 def parse_color_value(value: str) -> Optional[Tuple[int, int, int]]:
     """Parse color value from various formats."""
     value = value.strip().lower()
@@ -134,14 +176,18 @@ def parse_color_value(value: str) -> Optional[Tuple[int, int, int]]:
         hex_str = value.lstrip('#')
         return hex_to_rgb(hex_str)
     
-    # RGB/RGBA
+    # RGB/RGBA, clamping out-of-range channels to 255 as CSS does
     rgb_match = re.match(r'rgba?\((\d+),\s*(\d+),\s*(\d+)', value)
     if rgb_match:
-        return tuple(int(x) for x in rgb_match.groups())
+        return tuple(min(int(x), 255) for x in rgb_match.groups())
     
     return None
 
 
+# Token metadata keys that never hold nested tokens
+TOKEN_SKIP_KEYS = frozenset({"$type", "$value", "$description", "$extensions", "$schema", "meta"})
+
+
 def load_design_tokens() -> Dict:
     """Load design tokens from JSON files."""
     tokens = {}
@@ -167,7 +213,11 @@ def extract_colors(data: dict, prefix: str = "") -> Dict[str, str]:
     """Extract color values from design tokens."""
     colors = {}
     
-    def traverse(obj: dict, path: str = ""):
+    # Depth-first walk with an explicit stack; children are pushed in
+    # reverse so tokens are visited (and collected) in document order
+    stack = [(data, "")]
+    while stack:
+        obj, path = stack.pop()
         if isinstance(obj, dict):
             if obj.get("$type") == "color" and "$value" in obj:
                 full_path = f"{prefix}.{path}" if path else prefix
@@ -184,116 +234,198 @@ def extract_colors(data: dict, prefix: str = "") -> Dict[str, str]:
                         full_path = f"{prefix}.{path}.dark" if path else f"{prefix}.dark"
                         colors[full_path] = paths["dark"]
             else:
-                for key, value in obj.items():
-                    if key not in ["$type", "$value", "$description", "$extensions", "$schema", "meta"]:
-                        new_path = f"{path}.{key}" if path else key
-                        traverse(value, new_path)
+                children = [
+                    (value, f"{path}.{key}" if path else key)
+                    for key, value in obj.items()
+                    if key not in TOKEN_SKIP_KEYS
+                ]
+                stack.extend(reversed(children))
         elif isinstance(obj, list):
-            for i, item in enumerate(obj):
-                if isinstance(item, dict):
-                    new_path = f"{path}[{i}]" if path else f"[{i}]"
-                    traverse(item, new_path)
+            children = [
+                (item, f"{path}[{i}]" if path else f"[{i}]")
+                for i, item in enumerate(obj)
+                if isinstance(item, dict)
+            ]
+            stack.extend(reversed(children))
     
-    traverse(data)
     return colors
 
 
+# Common patterns to look for in Swift code, with the color role they imply.
+# Matches never span lines, mirroring a line-by-line scan.
+COLOR_USAGE_PATTERNS = [
+    (r'\.foregroundStyle\(([^)\n]+)\)', 'foreground'),
+    (r'\.foregroundColor\(([^)\n]+)\)', 'foreground'),
+    (r'\.background\(([^)\n]+)\)', 'background'),
+    (r'color:[^\S\n]*([^,}\n]+)', 'foreground'),
+    (r'Color\(hex:[^\S\n]*"([^"\n]+)"\)', 'foreground'),
+    (r'Color\(tokenValue:[^\S\n]*"([^"\n]+)"\)', 'foreground'),
+]
+
+# Compiled once; each pattern runs over the whole file text. Separate scans
+# keep re's literal-prefix search and still report overlapping matches from
+# different patterns (e.g. a Color(hex:) nested inside .background()).
+_COLOR_USAGE_RES = [(re.compile(pattern), color_type) for pattern, color_type in COLOR_USAGE_PATTERNS]
+
+# Literal substrings at least one of which every pattern requires; files
+# containing none of them cannot match and skip the regex scan entirely
+COLOR_USAGE_MARKERS = ('.foregroundStyle(', '.foregroundColor(', '.background(', 'color:', 'Color(')
+
+
+def iter_swift_files(root: Path) -> Iterator[Path]:
+    """Yield Swift source files under root."""
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith('.swift'):
+                yield Path(dirpath, filename)
+
+
+def scan_swift_file(swift_file: Path, cwd: Path) -> List[ColorPair]:
+    """Find color usage in a single Swift file."""
+    # (line, pattern index, pair) so results can be put back in the order
+    # of a line-by-line, pattern-by-pattern scan
+    matches = []
+    
+    try:
+        text = swift_file.read_text(encoding='utf-8', errors='replace')
+        if not any(marker in text for marker in COLOR_USAGE_MARKERS):
+            return []
+        
+        try:
+            rel_path = str(swift_file.relative_to(cwd))
+        except ValueError:
+            rel_path = str(swift_file)
+        
+        line_starts = [0] + [m.end() for m in re.finditer(r'\n', text)]
+        for pattern_index, (regex, color_type) in enumerate(_COLOR_USAGE_RES):
+            for match in regex.finditer(text):
+                color_value = match.group(1).strip()
+                # Skip if it's a DesignToken reference
+                if 'DesignToken' in color_value:
+                    continue
+                # Skip if it's a variable reference
+                if not (color_value.startswith('#') or 
+                        color_value.startswith('.') or
+                        'rgb' in color_value.lower()):
+                    continue
+                
+                line_num = bisect_right(line_starts, match.start())
+                line_end = line_starts[line_num] if line_num < len(line_starts) else len(text)
+                matches.append((line_num, pattern_index, ColorPair(
+                    foreground=color_value if color_type == 'foreground' else '',
+                    background=color_value if color_type == 'background' else '',
+                    context=text[line_starts[line_num - 1]:line_end].strip(),
+                    file=rel_path,
+                    line=line_num
+                )))
+    except Exception as e:
+        print(f"Warning: Could not process {swift_file}: {e}")
+    
+    # Matches are collected pattern by pattern over the whole file; put them
+    # back in line order, keeping pattern order within a line since the
+    # report lists only the first few usages. The sort is stable, so one
+    # pattern's matches on a line stay in column order.
+    matches.sort(key=lambda entry: entry[:2])
+    return [pair for _, _, pair in matches]
+
+
 def find_color_usage_in_code() -> List[ColorPair]:
     """Find color usage in Swift code."""
     color_pairs = []
     
-    # Common patterns to look for
-    patterns = [
-        (r'\.foregroundStyle\(([^)]+)\)', 'foreground'),
-        (r'\.foregroundColor\(([^)]+)\)', 'foreground'),
-        (r'\.background\(([^)]+)\)', 'background'),
-        (r'color:\s*([^,}]+)', 'foreground'),
-        (r'Color\(hex:\s*"([^"]+)"\)', 'foreground'),
-        (r'Color\(tokenValue:\s*"([^"]+)"\)', 'foreground'),
-    ]
-    
     ui_path = Path("Sources/DeduperUI")
     if not ui_path.exists():
         return color_pairs
     
     cwd = Path.cwd()
-    for swift_file in ui_path.rglob("*.swift"):
+    swift_files = list(iter_swift_files(ui_path))
+    
+    max_workers = min(PARALLEL_SCAN_MAX_WORKERS, os.cpu_count() or 1)
+    executor = None
+    # Worker startup outweighs the scan itself for small trees, and a single
+    # worker can only be slower than scanning in this process
+    if len(swift_files) >= PARALLEL_SCAN_MIN_FILES and max_workers >= 2:
         try:
-            with open(swift_file) as f:
-                for line_num, line in enumerate(f, 1):
-                    for pattern, color_type in patterns:
-                        matches = re.finditer(pattern, line)
-                        for match in matches:
-                            color_value = match.group(1).strip()
-                            # Skip if it's a DesignToken reference
-                            if 'DesignToken' in color_value:
-                                continue
-                            # Skip if it's a variable reference
-                            if not (color_value.startswith('#') or 
-                                    color_value.startswith('.') or
-                                    'rgb' in color_value.lower()):
-                                continue
-                            
-                            try:
-                                rel_path = swift_file.relative_to(cwd)
-                            except ValueError:
-                                rel_path = swift_file
-                            
-                            color_pairs.append(ColorPair(
-                                foreground=color_value if color_type == 'foreground' else '',
-                                background=color_value if color_type == 'background' else '',
-                                context=line.strip(),
-                                file=str(rel_path),
-                                line=line_num
-                            ))
-        except Exception as e:
-            print(f"Warning: Could not process {swift_file}: {e}")
-            continue
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        except (OSError, NotImplementedError) as e:
+            # No working process pool here (e.g. missing semaphore support)
+            print(f"Warning: Scanning serially, could not start worker processes: {e}")
+    
+    if executor is None:
+        for swift_file in swift_files:
+            color_pairs.extend(scan_swift_file(swift_file, cwd))
+        return color_pairs
+    
+    # About four chunks per worker keeps the load balanced without
+    # paying a round trip per file
+    chunksize = max(1, len(swift_files) // (max_workers * 4))
+    with executor:
+        for pairs in executor.map(scan_swift_file, swift_files, repeat(cwd), chunksize=chunksize):
+            color_pairs.extend(pairs)
     
     return color_pairs
 
 
-def audit_semantic_color_pairs(tokens: Dict) -> List[ContrastResult]:
-    """Audit common semantic color combinations."""
-    results = []
+# Common semantic pairs to test, as (foreground, background) paths
+SEMANTIC_PAIRS = [
+    ("foreground.primary", "background.primary"),
+    ("foreground.secondary", "background.primary"),
+    ("foreground.tertiary", "background.primary"),
+    ("foreground.onBrand", "background.brand"),
+    ("foreground.success", "background.primary"),
+    ("foreground.warning", "background.primary"),
+    ("foreground.danger", "background.primary"),
+    ("foreground.info", "background.primary"),
+    ("foreground.link", "background.primary"),
+    ("foreground.disabled", "background.disabled"),
+]
+
+
+# A resolved semantic pair: (fg_path, bg_path, fg_rgb, bg_rgb)
+SemanticPair = Tuple[str, str, Tuple[int, int, int], Tuple[int, int, int]]
+
+
+def resolve_semantic_pairs(tokens: Dict) -> List[SemanticPair]:
+    """Resolve semantic color pairs to (fg_path, bg_path, fg_rgb, bg_rgb)."""
+    pairs = []
     
-    # Common pairs to test
-    pairs = [
-        ("foreground.primary", "background.primary"),
-        ("foreground.secondary", "background.primary"),
-        ("foreground.tertiary", "background.primary"),
-        ("foreground.onBrand", "background.brand"),
-        ("foreground.success", "background.primary"),
-        ("foreground.warning", "background.primary"),
-        ("foreground.danger", "background.primary"),
-        ("foreground.info", "background.primary"),
-        ("foreground.link", "background.primary"),
-        ("foreground.disabled", "background.disabled"),
-    ]
+    # Resolved values per token path, shared by every pair in this audit
+    resolved: Dict[str, Optional[str]] = {}
     
     def resolve_token(token_path: str) -> Optional[str]:
         """Resolve token path to actual color value."""
-        # Try direct lookup
-        if token_path in tokens:
-            value = tokens[token_path]
-            # If it's a reference, resolve it
-            if isinstance(value, str) and value.startswith('{') and value.endswith('}'):
-                ref_path = value[1:-1]
-                # Try with and without semantic prefix
-                if not ref_path.startswith('semantic.') and not ref_path.startswith('core.'):
-                    # Try semantic first
-                    semantic_path = f"semantic.{ref_path}"
-                    if semantic_path in tokens:
-                        return resolve_token(semantic_path)
-                    # Try core
-                    core_path = f"core.{ref_path}"
-                    if core_path in tokens:
-                        return resolve_token(core_path)
-                return resolve_token(ref_path)
-            return value
-        return None
-    
-    for fg_path, bg_path in pairs:
+        chain = []
+        seen = set()
+        path = token_path
+        value = None
+        # Follow the reference chain until a concrete value, a path resolved
+        # earlier, a missing token or a reference cycle
+        while True:
+            if path in resolved:
+                value = resolved[path]
+                break
+            if path not in tokens or path in seen:
+                value = None
+                break
+            chain.append(path)
+            seen.add(path)
+            value = tokens[path]
+            if not (isinstance(value, str) and value.startswith('{') and value.endswith('}')):
+                break
+            path = value[1:-1]
+            # Try with and without semantic prefix
+            if not path.startswith('semantic.') and not path.startswith('core.'):
+                # Try semantic first, then core
+                if f"semantic.{path}" in tokens:
+                    path = f"semantic.{path}"
+                elif f"core.{path}" in tokens:
+                    path = f"core.{path}"
+        
+        for link in chain:
+            resolved[link] = value
+        return value
+    
+    for fg_path, bg_path in SEMANTIC_PAIRS:
         fg_value = resolve_token(f"semantic.color.{fg_path}")
         bg_value = resolve_token(f"semantic.color.{bg_path}")
         
@@ -304,15 +436,63 @@ def audit_semantic_color_pairs(tokens: Dict) -> List[ContrastResult]:
         bg_rgb = parse_color_value(bg_value)
         
         if fg_rgb and bg_rgb:
-            ratio = contrast_ratio(fg_rgb, bg_rgb)
+            pairs.append((fg_path, bg_path, fg_rgb, bg_rgb))
+    
+    return pairs
+
+
+def audit_semantic_color_pairs(semantic_pairs: List[SemanticPair]) -> List[ContrastResult]:
+    """Audit common semantic color combinations (as built by resolve_semantic_pairs)."""
+    results = []
+    
+    for fg_path, bg_path, fg_rgb, bg_rgb in semantic_pairs:
+        ratio = contrast_ratio(fg_rgb, bg_rgb)
+        level = get_contrast_level(ratio)
+        
+        results.append(ContrastResult(
+            foreground=f"semantic.color.{fg_path}",
+            background=f"semantic.color.{bg_path}",
+            ratio=ratio,
+            level=level,
+            context=f"Semantic pair: {fg_path} on {bg_path}",
+            file="designTokens",
+            line=0
+        ))
+    
+    return results
+
+
+def audit_colorblind_semantic_pairs(semantic_pairs: List[SemanticPair],
+                                    semantic_results: List[ContrastResult]) -> List[ContrastResult]:
+    """Find semantic pairs that pass WCAG AA but fail under simulated color blindness."""
+    results = []
+    
+    # audit_semantic_color_pairs yields one result per pair, in pair order
+    passing = [
+        pair for pair, result in zip(semantic_pairs, semantic_results)
+        if result.level != ContrastLevel.FAIL
+    ]
+    
+    for deficiency in COLORBLINDNESS_MATRICES:
+        fg_luminances = relative_luminances(
+            simulate_colorblindness(*fg_rgb, deficiency) for _, _, fg_rgb, _ in passing
+        )
+        bg_luminances = relative_luminances(
+            simulate_colorblindness(*bg_rgb, deficiency) for _, _, _, bg_rgb in passing
+        )
+        
+        for (fg_path, bg_path, _, _), fg, bg in zip(passing, fg_luminances, bg_luminances):
+            ratio = ratio_from_luminance(fg, bg)
             level = get_contrast_level(ratio)
+            if level != ContrastLevel.FAIL:
+                continue
             
             results.append(ContrastResult(
                 foreground=f"semantic.color.{fg_path}",
                 background=f"semantic.color.{bg_path}",
                 ratio=ratio,
                 level=level,
-                context=f"Semantic pair: {fg_path} on {bg_path}",
+                context=f"Semantic pair under {deficiency}: {fg_path} on {bg_path}",
                 file="designTokens",
                 line=0
             ))
@@ -320,8 +500,19 @@ def audit_semantic_color_pairs(tokens: Dict) -> List[ContrastResult]:
     return results
 
 
-def audit_palette_colors(tokens: Dict) -> List[ContrastResult]:
-    """Audit palette colors against common backgrounds."""
+def index_palette(tokens: Dict) -> Dict[str, Tuple[int, int, int]]:
+    """Index palette tokens by path with their parsed RGB values."""
+    palette_colors = {}
+    for key, value in tokens.items():
+        if "palette" in key.lower():
+            rgb = parse_color_value(value)
+            if rgb:
+                palette_colors[key] = rgb
+    return palette_colors
+
+
+def audit_palette_colors(palette_colors: Dict[str, Tuple[int, int, int]]) -> List[ContrastResult]:
+    """Audit palette colors (as built by index_palette) against common backgrounds."""
     results = []
     
     # Test palette colors against light and dark backgrounds
@@ -332,35 +523,40 @@ def audit_palette_colors(tokens: Dict) -> List[ContrastResult]:
         "black": "#000000",
     }
     
-    # Extract palette colors
-    palette_colors = {}
-    for key, value in tokens.items():
-        if "palette" in key.lower() and "$value" not in key:
-            rgb = parse_color_value(value)
-            if rgb:
-                palette_colors[key] = rgb
+    # Parse backgrounds and compute every luminance once, not once per pair
+    bg_colors = {}
+    for bg_name, bg_hex in backgrounds.items():
+        bg_rgb = parse_color_value(bg_hex)
+        if bg_rgb:
+            bg_colors[bg_name] = bg_rgb
     
-    for color_name, color_rgb in palette_colors.items():
-        for bg_name, bg_hex in backgrounds.items():
-            bg_rgb = parse_color_value(bg_hex)
-            if bg_rgb:
-                ratio = contrast_ratio(color_rgb, bg_rgb)
-                level = get_contrast_level(ratio)
-                
-                results.append(ContrastResult(
-                    foreground=color_name,
-                    background=bg_name,
-                    ratio=ratio,
-                    level=level,
-                    context=f"Palette color on {bg_name} background",
-                    file="designTokens",
-                    line=0
-                ))
+    ratios = contrast_ratio_matrix(
+        relative_luminances(palette_colors.values()),
+        relative_luminances(bg_colors.values()),
+    )
+    
+    for color_name, color_ratios in zip(palette_colors, ratios):
+        for bg_name, ratio in zip(bg_colors, color_ratios):
+            results.append(ContrastResult(
+                foreground=color_name,
+                background=bg_name,
+                ratio=ratio,
+                level=get_contrast_level(ratio),
+                context=f"Palette color on {bg_name} background",
+                file="designTokens",
+                line=0
+            ))
     
     return results
 
 
-def generate_report(results: List[ContrastResult], output_file: Optional[str] = None):
+# Row of the report's failure table: foreground, background, ratio, context, file
+FAILURE_ROW_FORMAT = "| {} | {} | {:.2f}:1 | {} | {} |"
+
+
+def generate_report(results: List[ContrastResult], output_file: Optional[str] = None,
+                    colorblind_results: Optional[List[ContrastResult]] = None,
+                    hardcoded_colors: Optional[List[ColorPair]] = None):
     """Generate accessibility audit report."""
     report_lines = [
         "# Color Accessibility Audit Report",
@@ -370,9 +566,7 @@ def generate_report(results: List[ContrastResult], output_file: Optional[str] =
     ]
     
     # Count by level
-    level_counts = {}
-    for result in results:
-        level_counts[result.level] = level_counts.get(result.level, 0) + 1
+    level_counts = Counter(result.level for result in results)
     
     total = len(results)
     report_lines.append(f"**Total color pairs tested:** {total}")
@@ -383,7 +577,7 @@ def generate_report(results: List[ContrastResult], output_file: Optional[str] =
     report_lines.append("|-------|-------|------------|")
     
     for level in ContrastLevel:
-        count = level_counts.get(level, 0)
+        count = level_counts[level]
         percentage = (count / total * 100) if total > 0 else 0
         report_lines.append(f"| {level.value} | {count} | {percentage:.1f}% |")
     
@@ -395,11 +589,10 @@ def generate_report(results: List[ContrastResult], output_file: Optional[str] =
     if failures:
         report_lines.append("| Foreground | Background | Ratio | Context | File |")
         report_lines.append("|------------|------------|-------|---------|------|")
-        for failure in failures:
-            report_lines.append(
-                f"| {failure.foreground} | {failure.background} | "
-                f"{failure.ratio:.2f}:1 | {failure.context} | {failure.file} |"
-            )
+        report_lines.extend([
+            FAILURE_ROW_FORMAT.format(f.foreground, f.background, f.ratio, f.context, f.file)
+            for f in failures
+        ])
     else:
         report_lines.append("✅ No failures found!")
     
@@ -418,8 +611,9 @@ def generate_report(results: List[ContrastResult], output_file: Optional[str] =
             report_lines.append(f"  - Increase contrast by at least {WCAG_AA_NORMAL - failure.ratio:.2f}")
             report_lines.append("")
     
-    # Check for hardcoded colors
-    hardcoded_colors = find_color_usage_in_code()
+    # Check for hardcoded colors, unless the caller already scanned for them
+    if hardcoded_colors is None:
+        hardcoded_colors = find_color_usage_in_code()
     if hardcoded_colors:
         report_lines.append("### Hardcoded Colors")
         report_lines.append("")
@@ -433,6 +627,19 @@ def generate_report(results: List[ContrastResult], output_file: Optional[str] =
     report_lines.append("")
     report_lines.append("## Color Blindness Compatibility")
     report_lines.append("")
+    
+    if colorblind_results is not None:
+        report_lines.append("### Simulated Color Blindness")
+        report_lines.append("")
+        if colorblind_results:
+            report_lines.append("The following semantic pairs pass WCAG AA but fail under simulation:")
+            report_lines.append("")
+            for result in colorblind_results:
+                report_lines.append(f"- **{result.context}**: Ratio {result.ratio:.2f}:1")
+        else:
+            report_lines.append("✅ No semantic pairs fail only under simulated color blindness.")
+        report_lines.append("")
+    
     report_lines.append("### Status Colors")
     report_lines.append("")
     report_lines.append("Ensure status colors (success, warning, danger, info) are distinguishable:")
@@ -466,14 +673,25 @@ def main():
     
     # Audit semantic color pairs
     print("Auditing semantic color pairs...")
-    semantic_results = audit_semantic_color_pairs(tokens)
+    semantic_pairs = resolve_semantic_pairs(tokens)
+    semantic_results = audit_semantic_color_pairs(semantic_pairs)
     print(f"Tested {len(semantic_results)} semantic color pairs")
     
+    # Re-test passing semantic pairs under simulated color blindness
+    print("Simulating color blindness for semantic pairs...")
+    colorblind_results = audit_colorblind_semantic_pairs(semantic_pairs, semantic_results)
+    print(f"Found {len(colorblind_results)} pairs failing only under simulation")
+    
     # Audit palette colors
     print("Auditing palette colors...")
-    palette_results = audit_palette_colors(tokens)
+    palette_results = audit_palette_colors(index_palette(tokens))
     print(f"Tested {len(palette_results)} palette color combinations")
     
+    # Scan Swift code for hardcoded colors
+    print("Scanning code for hardcoded colors...")
+    hardcoded_colors = find_color_usage_in_code()
+    print(f"Found {len(hardcoded_colors)} hardcoded color usages")
+    
     # Combine results
     all_results = semantic_results + palette_results
     
@@ -482,7 +700,7 @@ def main():
     print("Generating report...")
     report_path = Path("docs/accessibility/color-audit-report.md")
     report_path.parent.mkdir(parents=True, exist_ok=True)
-    generate_report(all_results, str(report_path))
+    generate_report(all_results, str(report_path), colorblind_results, hardcoded_colors)
     
     # Summary
     failures = [r for r in all_results if r.level == ContrastLevel.FAIL]